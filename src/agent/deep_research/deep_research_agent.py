@@ -1,18 +1,29 @@
+from __future__ import annotations
+
 import asyncio
+import functools
 import json
 import logging
 import os
+import string
 import threading
+import time
 import uuid
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from browser_use.browser.profile import BrowserProfile
-from browser_use.llm import BaseChatModel, UserMessage, SystemMessage, AssistantMessage
+import aiofiles
+import httpx
+import orjson
 from pydantic import BaseModel, Field
 
-# Using browser_use.Agent directly
-from browser_use import Controller
+from src.utils.semantic_cache import SemanticCache
+
+# browser_use is imported where it is used to keep module import cheap
+if TYPE_CHECKING:
+    from browser_use import Controller
+    from browser_use.llm import BaseChatModel, SystemMessage, UserMessage
 
 logger = logging.getLogger(__name__)
 
@@ -21,38 +32,122 @@ REPORT_FILENAME = "report.md"
 PLAN_FILENAME = "research_plan.md"
 SEARCH_INFO_FILENAME = "search_info.json"
 
-# Global state management
-_AGENT_STOP_FLAGS = {}
-_BROWSER_AGENT_INSTANCES = {}
 
-# Simple file operations to replace langchain tools
-def read_file_content(file_path: str) -> str:
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer setting, falling back to the default on invalid values"""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        logger.warning("Invalid %s value, using %d", name, default)
+        return default
+
+
+# Upper bound on browser tasks running at once; override per agent via browser_config["max_concurrency"]
+DEFAULT_MAX_CONCURRENCY = _env_int("DEEP_RESEARCH_MAX_CONCURRENCY", 4)
+DEFAULT_MAX_SUBQUERIES = 5
+# Cap on each sub-query's result in the report prompt, so fan-out doesn't multiply prompt size unbounded
+MAX_SUBQUERY_RESULT_CHARS = 8000
+# Connection pool limits for the HTTP client shared by all LLM calls of a research run
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+# Report prompts are kept byte-identical across calls so providers can cache the prompt prefix
+REPORT_SYSTEM_PROMPT = "You are an expert research analyst who creates comprehensive, well-structured reports."
+REPORT_STATIC_INSTRUCTIONS = """
+You are a research analyst tasked with creating a comprehensive report.
+The research question and the research data gathered by browser agents follow in the next message.
+
+Please create a well-structured, comprehensive research report that includes:
+1. Executive Summary
+2. Key Findings
+3. Detailed Analysis
+4. Conclusions and Recommendations
+5. Sources (if any were found)
+
+Format the report in clear markdown with appropriate headings and structure.
+"""
+REPORT_ERROR_HEADER = "# Research Report\n\n## Error\n"
+REPORT_DATA_TEMPLATE = string.Template("Research Question: $query\n\nResearch Data:\n$data")
+
+# Global state management, shared by concurrent browser tasks
+_STATE_LOCK = threading.Lock()
+# Weak references so finished agents (and their browser sessions) can be garbage collected
+_BROWSER_AGENT_INSTANCES: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+
+
+@functools.lru_cache(maxsize=None)
+def _report_prefix_messages() -> Tuple[SystemMessage, UserMessage]:
+    """Static report messages, built once and shared; browser-use serializers only read messages"""
+    from browser_use.llm import SystemMessage, UserMessage
+    return (
+        SystemMessage(content=REPORT_SYSTEM_PROMPT),
+        UserMessage(content=REPORT_STATIC_INSTRUCTIONS, cache=True),
+    )
+
+# Simple file operations to replace langchain tools, kept off the event loop
+async def read_file_content(file_path: str) -> str:
     """Read content from a file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+            return await f.read()
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
-def write_file_content(file_path: str, content: str) -> str:
+async def write_file_content(file_path: str, content: str) -> str:
     """Write content to a file"""
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(file_path), exist_ok=True)
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write(content)
         return f"Successfully wrote to {file_path}"
     except Exception as e:
         return f"Error writing file: {str(e)}"
 
-def list_directory_contents(directory_path: str) -> str:
+async def list_directory_contents(directory_path: str) -> str:
     """List contents of a directory"""
     try:
-        contents = os.listdir(directory_path)
+        contents = await asyncio.to_thread(os.listdir, directory_path)
         return "\n".join(contents)
     except Exception as e:
         return f"Error listing directory: {str(e)}"
 
 
+def _response_text(response: Any) -> str:
+    """Extract the text from the different response types returned by browser-use LLMs"""
+    if hasattr(response, 'completion'):
+        return str(response.completion)
+    elif hasattr(response, 'content'):
+        return response.content
+    elif hasattr(response, 'text'):
+        return response.text
+    else:
+        return str(response)
+
+
+@functools.lru_cache(maxsize=32)
+def _output_paths(output_dir: str) -> Tuple[Path, Path, Path]:
+    """Report, plan and search info paths inside a research output directory"""
+    base = Path(output_dir)
+    return base / REPORT_FILENAME, base / PLAN_FILENAME, base / SEARCH_INFO_FILENAME
+
+
+class SearchInfo(BaseModel):
+    """Per sub-query search metadata, stored column-wise in SEARCH_INFO_FILENAME"""
+    queries: List[str] = Field(default_factory=list)
+    statuses: List[str] = Field(default_factory=list)
+    urls: List[List[str]] = Field(default_factory=list)
+    timestamps: List[float] = Field(default_factory=list)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_shared_controller(exclude_actions: Tuple[str, ...] = ()) -> Controller:
+    """
+    Controller shared by all browser tasks. Building the action registry is costly and
+    Agent only mutates it when given an output model, which browser tasks never use.
+    """
+    from browser_use import Controller
+    return Controller(exclude_actions=list(exclude_actions))
+
+
 async def run_single_browser_task(
         task_query: str,
         task_id: str,
@@ -65,8 +160,10 @@ async def run_single_browser_task(
     Simplified browser task runner using browser-use Agent
     """
     try:
-        logger.info(f"Running browser task: {task_query}")
+        logger.info("Running browser task: %s", task_query)
         
+        from browser_use.browser.profile import BrowserProfile
+
         # Create browser profile  
         browser_profile = BrowserProfile(
             headless=browser_config.get("headless", True),
@@ -77,7 +174,7 @@ async def run_single_browser_task(
         )
         
         # Use browser-use Agent directly with browser profile
-        controller = Controller()
+        controller = _get_shared_controller()
         
         # Create browser agent using browser-use Agent class
         from browser_use import Agent
@@ -90,22 +187,26 @@ async def run_single_browser_task(
         )
         
         # Store instance for potential stop
-        _BROWSER_AGENT_INSTANCES[task_id] = browser_agent
+        with _STATE_LOCK:
+            _BROWSER_AGENT_INSTANCES[task_id] = browser_agent
         
         if stop_event.is_set():
             return {"query": task_query, "result": None, "status": "cancelled"}
         
         # Run the browser agent
         result = await browser_agent.run()
+        # Keep only what the agent extracted, not the full action history
+        content = result.final_result() or "\n".join(result.extracted_content())
         
         return {
             "query": task_query,
-            "result": str(result),
-            "status": "completed"
+            "result": content[:MAX_SUBQUERY_RESULT_CHARS],
+            "status": "completed",
+            "urls": list(dict.fromkeys(url for url in result.urls() if url)),
         }
         
     except Exception as e:
-        logger.error(f"Browser task failed: {e}", exc_info=True)
+        logger.error("Browser task failed: %s", e, exc_info=True)
         return {
             "query": task_query,
             "result": f"Error: {str(e)}",
@@ -113,8 +214,8 @@ async def run_single_browser_task(
         }
     finally:
         # Cleanup
-        if task_id in _BROWSER_AGENT_INSTANCES:
-            del _BROWSER_AGENT_INSTANCES[task_id]
+        with _STATE_LOCK:
+            _BROWSER_AGENT_INSTANCES.pop(task_id, None)
 
 
 class DeepResearchAgent:
@@ -122,6 +223,8 @@ class DeepResearchAgent:
             self,
             llm: BaseChatModel,
             browser_config: Dict[str, Any],
+            report_cache: Optional[SemanticCache] = None,
+            subquery_cache: Optional[SemanticCache] = None,
     ):
         """
         Simplified Deep Research Agent without langchain dependencies.
@@ -130,6 +233,10 @@ class DeepResearchAgent:
             llm: Browser-use compatible language model instance.
             browser_config: Configuration dictionary for the BrowserUseAgent tool.
                             Example: {"headless": True, "window_width": 1280, ...}
+            report_cache: Cache of report contents for previously researched queries.
+                          Defaults to an in-memory SemanticCache.
+            subquery_cache: Cache of browser results for previously researched sub-queries.
+                            Defaults to an in-memory SemanticCache.
         """
         self.llm = llm
         self.browser_config = browser_config
@@ -137,6 +244,61 @@ class DeepResearchAgent:
         self.current_task_id: Optional[str] = None
         self.stop_event: Optional[threading.Event] = None
         self.runner: Optional[asyncio.Task] = None
+        self.report_cache = report_cache if report_cache is not None else SemanticCache()
+        self.subquery_cache = subquery_cache if subquery_cache is not None else SemanticCache()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._shared_llm: Optional[BaseChatModel] = None
+
+    def _ensure_http_client(self):
+        """Share one connection pool across the LLM calls of concurrent browser tasks"""
+        # browser-use OpenAI-style models build a new SDK client per call unless given an http_client.
+        # The run uses a copy that holds the pool; copy_llm also handles models wrapped by the response cache.
+        if self._http_client is None and getattr(self.llm, "http_client", False) is None:
+            from src.utils.llm_provider import copy_llm
+
+            self._http_client = httpx.AsyncClient(limits=HTTP_POOL_LIMITS)
+            self._shared_llm = self.llm
+            self.llm = copy_llm(self.llm, http_client=self._http_client)
+
+    async def aclose(self):
+        """Close the shared HTTP client and restore the LLM it was attached to"""
+        if self._http_client is None:
+            return
+        self.llm, self._shared_llm = self._shared_llm, None
+        client, self._http_client = self._http_client, None
+        await client.aclose()
+
+    async def plan_subqueries(self, query: str) -> List[str]:
+        """Split the research query into focused sub-queries with a single LLM call"""
+        from browser_use.llm import SystemMessage, UserMessage
+
+        max_subqueries = self.browser_config.get("max_subqueries", DEFAULT_MAX_SUBQUERIES)
+        prompt = f"""
+Break the following research question into at most {max_subqueries} focused sub-queries that can each be
+researched independently with a web browser. Together they should cover all aspects of the question.
+
+Research Question: {query}
+
+Respond with a JSON list of strings only, for example: ["sub-query 1", "sub-query 2"]
+"""
+        messages = [
+            SystemMessage(content="You are an expert research planner who decomposes questions into web search tasks."),
+            UserMessage(content=prompt)
+        ]
+        try:
+            response = await self.llm.ainvoke(messages)
+            text = _response_text(response).strip()
+            if text.startswith("```"):
+                text = text.strip("`").removeprefix("json").strip()
+            parsed = json.loads(text)
+            if not isinstance(parsed, list):
+                raise ValueError(f"expected a JSON list, got {type(parsed).__name__}")
+            subqueries = [str(q).strip() for q in parsed if str(q).strip()]
+            if subqueries:
+                return subqueries[:max_subqueries]
+        except Exception as e:
+            logger.warning("Sub-query planning failed, researching the query as a whole: %s", e)
+        return [query]
 
     async def research(self, query: str, output_dir: str = "./research_output") -> str:
         """
@@ -149,95 +311,145 @@ class DeepResearchAgent:
         Returns:
             Path to the generated report
         """
+        # The agent is reused across runs, so clear any stop request left by the previous one.
+        # The event exists for the whole run so a stop during planning still reaches the browser tasks.
+        self.stopped = False
+        self.stop_event = threading.Event()
         try:
             # Create output directory
-            os.makedirs(output_dir, exist_ok=True)
+            await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
             
             # Generate task ID
             task_id = f"research_{uuid.uuid4().hex[:8]}"
             self.current_task_id = task_id
             
-            logger.info(f"Starting research on: {query}")
-            
-            # Use browser agent to gather information
-            browser_results = await self._conduct_browser_research(query, task_id)
-            
-            # Generate report using LLM
-            report_content = await self._generate_report(query, browser_results)
+            logger.info("Starting research on: %s", query)
+            self._ensure_http_client()
+
+            report_file, _, search_info_file = _output_paths(output_dir)
+            report_path = os.fspath(report_file)
+
+            # Reuse the report of a semantically equivalent query researched earlier
+            cached_report = await asyncio.to_thread(self.report_cache.get, query)
+            if cached_report is not None:
+                await write_file_content(report_path, cached_report)
+                logger.info("Reused cached report for similar query. Report saved to: %s", report_path)
+                return report_path
+
+            # Split the query and gather information with concurrent browser agents
+            subqueries = await self.plan_subqueries(query)
+            logger.info("Researching %d sub-queries: %s", len(subqueries), subqueries)
+            browser_results = await self._conduct_browser_research(
+                subqueries, task_id, os.fspath(search_info_file)
+            )
             
-            # Save report
-            report_path = os.path.join(output_dir, REPORT_FILENAME)
-            write_file_content(report_path, report_content)
+            # Generate report using LLM and save it
+            report_content = await self._generate_report(query, browser_results, report_path)
+            if not self.stopped and not report_content.startswith(REPORT_ERROR_HEADER):
+                await asyncio.to_thread(self.report_cache.add, query, report_content)
             
-            logger.info(f"Research complete. Report saved to: {report_path}")
+            logger.info("Research complete. Report saved to: %s", report_path)
             return report_path
             
         except Exception as e:
-            logger.error(f"Research failed: {e}", exc_info=True)
+            logger.error("Research failed: %s", e, exc_info=True)
             raise
         finally:
             self.current_task_id = None
+            await self.aclose()
 
-    async def _conduct_browser_research(self, query: str, task_id: str) -> str:
-        """Conduct research using browser agent"""
-        try:
-            stop_event = threading.Event()
-            result = await run_single_browser_task(
-                task_query=f"Research and gather comprehensive information about: {query}",
-                task_id=task_id,
-                llm=self.llm,
-                browser_config=self.browser_config,
-                stop_event=stop_event,
-                use_vision=False
-            )
-            return result.get("result", "No results found")
-        except Exception as e:
-            logger.error(f"Browser research failed: {e}")
-            return f"Error conducting research: {str(e)}"
+    async def _conduct_browser_research(self, subqueries: List[str], task_id: str, search_info_path: str) -> str:
+        """Conduct research using one browser agent per sub-query, bounded by max_concurrency"""
+        from src.utils.llm_provider import copy_llm
 
-    async def _generate_report(self, query: str, research_data: str) -> str:
-        """Generate a comprehensive research report"""
-        try:
-            prompt = f"""
-You are a research analyst tasked with creating a comprehensive report.
+        max_concurrency = max(1, self.browser_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        if self.browser_config.get("user_data_dir") and max_concurrency > 1:
+            # Chrome locks its profile directory, so browsers sharing one cannot run side by side
+            logger.info("user_data_dir is set, running browser tasks one at a time")
+            max_concurrency = 1
+        sem = asyncio.Semaphore(max_concurrency)
 
-Research Question: {query}
+        async def run_subquery(index: int, subquery: str) -> Tuple[Dict[str, Any], float]:
+            async with sem:
+                # Skip sub-queries still queued (or not yet started) when the research is stopped
+                if self.stop_event.is_set():
+                    return {"query": subquery, "result": None, "status": "cancelled"}, time.time()
+                result = await run_single_browser_task(
+                    task_query=f"Research and gather comprehensive information about: {subquery}",
+                    task_id=f"{task_id}_{index}",
+                    # Each Agent wraps ainvoke for token tracking, so it needs a model of its own
+                    llm=copy_llm(self.llm),
+                    browser_config=self.browser_config,
+                    stop_event=self.stop_event,
+                    use_vision=False
+                )
+                return result, time.time()
 
-Research Data:
-{research_data}
+        # Reuse browser results of similar sub-queries; only misses are sent to browser agents
+        results: List[Any] = await asyncio.to_thread(self.subquery_cache.get_many, subqueries)
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if len(misses) < len(subqueries):
+            logger.info("Reusing cached browser results for %d of %d sub-queries",
+                        len(subqueries) - len(misses), len(subqueries))
+        fresh = await asyncio.gather(
+            *(run_subquery(i, subqueries[i]) for i in misses),
+            return_exceptions=True,
+        )
+        for i, outcome in zip(misses, fresh):
+            results[i] = outcome
+        completed = [i for i, outcome in zip(misses, fresh)
+                     if not isinstance(outcome, Exception) and outcome[0].get("status") == "completed"]
+        if completed:
+            await asyncio.to_thread(
+                self.subquery_cache.add_many,
+                [subqueries[i] for i in completed],
+                [results[i] for i in completed],
+            )
 
-Please create a well-structured, comprehensive research report that includes:
-1. Executive Summary
-2. Key Findings
-3. Detailed Analysis
-4. Conclusions and Recommendations
-5. Sources (if any were found)
+        sections = []
+        search_info = SearchInfo()
+        for subquery, outcome in zip(subqueries, results):
+            if isinstance(outcome, Exception):
+                logger.error("Browser research failed for '%s': %s", subquery, outcome)
+                content = f"Error conducting research: {str(outcome)}"
+                result, finished_at = {"status": "failed"}, time.time()
+            else:
+                result, finished_at = outcome
+                content = result.get("result") or "No results found"
+            sections.append(f"## {subquery}\n\n{content}")
+            search_info.queries.append(subquery)
+            search_info.statuses.append(result.get("status", "failed"))
+            search_info.urls.append(result.get("urls", []))
+            search_info.timestamps.append(finished_at)
 
-Format the report in clear markdown with appropriate headings and structure.
-"""
-            
-            messages = [
-                SystemMessage(content="You are an expert research analyst who creates comprehensive, well-structured reports."),
-                UserMessage(content=prompt)
-            ]
-            
+        await asyncio.to_thread(
+            Path(search_info_path).write_bytes,
+            orjson.dumps(search_info.model_dump(), option=orjson.OPT_APPEND_NEWLINE),
+        )
+        return "\n\n".join(sections)
+
+    async def _generate_report(self, query: str, research_data: str, report_path: str) -> str:
+        """Generate a comprehensive research report and write it to report_path"""
+        from browser_use.llm import UserMessage
+
+        # Static prefix first so providers can reuse their prompt cache across reports
+        messages = [
+            *_report_prefix_messages(),
+            UserMessage(content=REPORT_DATA_TEMPLATE.substitute(query=query, data=research_data))
+        ]
+        try:
             response = await self.llm.ainvoke(messages)
-            # Handle different response types from browser-use LLMs
-            if hasattr(response, 'content'):
-                return response.content
-            elif hasattr(response, 'text'):
-                return response.text
-            else:
-                return str(response)
+            report_content = _response_text(response)
             
         except Exception as e:
-            logger.error(f"Report generation failed: {e}")
-            return f"# Research Report\n\n## Error\nFailed to generate report: {str(e)}\n\n## Raw Data\n{research_data}"
+            logger.error("Report generation failed: %s", e)
+            report_content = f"{REPORT_ERROR_HEADER}Failed to generate report: {str(e)}\n\n## Raw Data\n{research_data}"
+
+        await write_file_content(report_path, report_content)
+        return report_content
 
     def stop(self):
         """Stop the research process"""
         self.stopped = True
-        if self.current_task_id:
-            _AGENT_STOP_FLAGS[self.current_task_id] = True
         if self.stop_event:
             self.stop_event.set()
@@ -1,19 +1,66 @@
 import asyncio
+import functools
 import pdb
 
 from browser_use.browser.session import BrowserSession
-from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.profile import (
+    BrowserProfile,
+    CHROME_DEFAULT_ARGS as CHROME_ARGS,
+    CHROME_DETERMINISTIC_RENDERING_ARGS,
+    CHROME_DISABLE_SECURITY_ARGS,
+    CHROME_DOCKER_ARGS,
+    CHROME_HEADLESS_ARGS,
+    get_display_size,
+    get_window_adjustments,
+)
+from browser_use.config import CONFIG
 import logging
 
 # Chrome args and utils imports need to be updated for browser_use 0.6.0
 # These modules have been restructured in the new version
 from browser_use.utils import time_execution_async
-import socket
 
 from .custom_context import CustomBrowserContext
 
 logger = logging.getLogger(__name__)
 
+IN_DOCKER = CONFIG.IN_DOCKER
+_BASE_CHROME_ARGS = frozenset(CHROME_ARGS) | (frozenset(CHROME_DOCKER_ARGS) if IN_DOCKER else frozenset())
+
+
+@functools.lru_cache(maxsize=None)
+def _static_chrome_args(headless: bool, disable_security: bool, deterministic_rendering: bool) -> frozenset:
+    """Chrome args that only depend on config flags, built once per flag combination"""
+    args = _BASE_CHROME_ARGS
+    if headless:
+        args |= frozenset(CHROME_HEADLESS_ARGS)
+    if disable_security:
+        args |= frozenset(CHROME_DISABLE_SECURITY_ARGS)
+    if deterministic_rendering:
+        args |= frozenset(CHROME_DETERMINISTIC_RENDERING_ARGS)
+    return args
+
+
+# Display geometry doesn't change within a process, so look it up once per launch-heavy session
+@functools.cache
+def get_screen_resolution() -> dict:
+    size = get_display_size()
+    return {'width': size.width, 'height': size.height} if size else {'width': 1920, 'height': 1080}
+
+
+get_window_adjustments = functools.cache(get_window_adjustments)
+
+
+async def _port_in_use(port: int, timeout: float = 0.05) -> bool:
+    """Probe a local port without blocking the event loop"""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection('localhost', port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
 
 class CustomBrowser(BrowserSession):
 
@@ -47,23 +94,22 @@ class CustomBrowser(BrowserSession):
             screen_size = get_screen_resolution()
             offset_x, offset_y = get_window_adjustments()
 
-        chrome_args = {
+        chrome_args = set(_static_chrome_args(
+            self.config.headless,
+            self.config.disable_security,
+            self.config.deterministic_rendering,
+        ))
+        chrome_args.update((
             f'--remote-debugging-port={self.config.chrome_remote_debugging_port}',
-            *CHROME_ARGS,
-            *(CHROME_DOCKER_ARGS if IN_DOCKER else []),
-            *(CHROME_HEADLESS_ARGS if self.config.headless else []),
-            *(CHROME_DISABLE_SECURITY_ARGS if self.config.disable_security else []),
-            *(CHROME_DETERMINISTIC_RENDERING_ARGS if self.config.deterministic_rendering else []),
             f'--window-position={offset_x},{offset_y}',
             f'--window-size={screen_size["width"]},{screen_size["height"]}',
             *self.config.extra_browser_args,
-        }
+        ))
 
         # check if chrome remote debugging port is already taken,
         # if so remove the remote-debugging-port arg to prevent conflicts
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            if s.connect_ex(('localhost', self.config.chrome_remote_debugging_port)) == 0:
-                chrome_args.remove(f'--remote-debugging-port={self.config.chrome_remote_debugging_port}')
+        if await _port_in_use(self.config.chrome_remote_debugging_port):
+            chrome_args.discard(f'--remote-debugging-port={self.config.chrome_remote_debugging_port}')
 
         browser_class = getattr(playwright_instance, self.config.browser_class)
         args = {
@@ -9,18 +9,40 @@ from browser_use import Controller
 # Removed unused imports: DoneAction, Registry, MainContentExtractor, and view classes
 import logging
 import inspect
+import time
 # import asyncio  # Unused
 # import os  # Unused
 from browser_use.llm import BaseChatModel
 from browser_use.agent.views import ActionModel, ActionResult
 from src.utils.mcp_client import get_mcp_manager, MCPManager
 
-from browser_use.utils import time_execution_sync
-
 logger = logging.getLogger(__name__)
 
 # Context = TypeVar('Context')  # Removed - not used in browser-use 0.7.10
 
+ASK_FOR_ASSISTANT_DESCRIPTION = (
+    "When executing tasks, prioritize autonomous completion. However, if you encounter a definitive blocker "
+    "that prevents you from proceeding independently – such as needing credentials you don't possess, "
+    "requiring subjective human judgment, needing a physical action performed, encountering complex CAPTCHAs, "
+    "or facing limitations in your capabilities – you must request human assistance."
+)
+
+
+class ActStats:
+    """Timing of act() calls aggregated over a task, logged once instead of per call"""
+    __slots__ = ("n", "total", "mx")
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0
+        self.mx = 0
+
+
+# Params of ask_for_assistant, defined once so the registry doesn't rebuild the model per controller.
+# No docstring: pydantic would put it in the action schema sent to the LLM in place of the description.
+class AskForAssistantParams(BaseModel):
+    query: str
+
 
 class CustomController(Controller):
     def __init__(self, exclude_actions: list[str] = [],
@@ -32,17 +54,14 @@ class CustomController(Controller):
         self._register_custom_actions()
         self.ask_assistant_callback = ask_assistant_callback
         self.mcp_manager: Optional[MCPManager] = None
+        self._act_stats = ActStats()
 
     def _register_custom_actions(self):
         """Register all custom browser actions"""
 
-        @self.registry.action(
-            "When executing tasks, prioritize autonomous completion. However, if you encounter a definitive blocker "
-            "that prevents you from proceeding independently – such as needing credentials you don't possess, "
-            "requiring subjective human judgment, needing a physical action performed, encountering complex CAPTCHAs, "
-            "or facing limitations in your capabilities – you must request human assistance."
-        )
-        async def ask_for_assistant(query: str, browser_session: BrowserSession):
+        @self.registry.action(ASK_FOR_ASSISTANT_DESCRIPTION, param_model=AskForAssistantParams)
+        async def ask_for_assistant(params: AskForAssistantParams, browser_session: BrowserSession):
+            query = params.query
             if self.ask_assistant_callback:
                 if inspect.iscoroutinefunction(self.ask_assistant_callback):
                     user_response = await self.ask_assistant_callback(query, browser_session)
@@ -66,7 +85,6 @@ class CustomController(Controller):
         #     # This needs to be reimplemented using browser_use 0.6.0 API
         #     return ActionResult(error='File upload not yet implemented for browser_use 0.6.0')
 
-    @time_execution_sync('--act')
     async def act(
             self,
             action: ActionModel,
@@ -81,14 +99,32 @@ class CustomController(Controller):
         """Execute an action using parent class - MCP functionality removed"""
         
         # Delegate to parent class for all actions
-        return await super().act(
-            action=action,
-            browser_session=browser_session,
-            page_extraction_llm=page_extraction_llm,
-            sensitive_data=sensitive_data,
-            available_file_paths=available_file_paths,
-            file_system=file_system,
-        )
+        start = time.perf_counter_ns()
+        try:
+            return await super().act(
+                action=action,
+                browser_session=browser_session,
+                page_extraction_llm=page_extraction_llm,
+                sensitive_data=sensitive_data,
+                available_file_paths=available_file_paths,
+                file_system=file_system,
+            )
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            stats = self._act_stats
+            stats.n += 1
+            stats.total += elapsed
+            stats.mx = max(stats.mx, elapsed)
+
+    def log_act_stats(self):
+        """Log the aggregated act() timings since the last call and reset them"""
+        stats = self._act_stats
+        if stats.n:
+            logger.debug(
+                "--act: %d calls, total %.2fs, avg %.2fs, max %.2fs",
+                stats.n, stats.total / 1e9, stats.total / stats.n / 1e9, stats.mx / 1e9,
+            )
+        self._act_stats = ActStats()
 
     async def setup_mcp_client(self, mcp_server_config: Optional[Dict[str, Any]] = None):
         """Set up MCP servers using browser-use's native MCP implementation."""
@@ -107,24 +143,25 @@ class CustomController(Controller):
             
             if success:
                 # Register MCP tools to this controller
-                tool_count = self.mcp_manager.register_tools_to_controller(self)
-                logger.info(f"Successfully set up MCP with {tool_count} server(s)")
+                tool_count = await self.mcp_manager.register_tools_to_controller_async(self)
+                logger.info("Successfully set up MCP with %d server(s)", tool_count)
                 
-                connected_servers = self.mcp_manager.get_connected_servers()
-                logger.info(f"Connected MCP servers: {connected_servers}")
+                connected_servers = self.mcp_manager.get_connected_servers_list()
+                logger.info("Connected MCP servers: %s", connected_servers)
             else:
                 logger.warning("Failed to set up MCP servers")
                 
         except Exception as e:
-            logger.error(f"Error setting up MCP client: {e}", exc_info=True)
+            logger.error("Error setting up MCP client: %s", e, exc_info=True)
     
     async def close_mcp_client(self):
         """Close MCP connections."""
+        self.log_act_stats()
         if self.mcp_manager:
             try:
                 await self.mcp_manager.disconnect_all()
                 logger.info("Closed all MCP connections")
             except Exception as e:
-                logger.error(f"Error closing MCP connections: {e}")
+                logger.error("Error closing MCP connections: %s", e)
             finally:
                 self.mcp_manager = None
@@ -1,6 +1,13 @@
+import dataclasses
+import functools
+import hashlib
+import json
 import os
 import logging
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import LRUCache, TTLCache
 
 # Browser-use LLM imports
 from browser_use.llm.openai.chat import ChatOpenAI
@@ -21,6 +28,65 @@ logger = logging.getLogger(__name__)
 # as they require specific reasoning content handling not available in browser-use
 
 
+@functools.lru_cache(maxsize=None)
+def _env(name: str, default: str = "") -> str:
+    """Environment lookup cached for the process; settings are loaded from .env once at startup"""
+    return os.environ.get(name, default)
+
+
+# Response caches of deterministic models, shared by all models built with the same settings
+_RESPONSE_CACHES: "LRUCache[str, TTLCache]" = LRUCache(maxsize=16)
+
+
+def _llm_cache_key(provider: str, kwargs: Dict[str, Any]) -> str:
+    settings = {k: kwargs.get(k) for k in ("model_name", "base_url", "temperature", "api_key", "num_ctx")}
+    return hashlib.sha256(json.dumps({"provider": provider, **settings}, sort_keys=True).encode()).hexdigest()
+
+
+class _CachingChat:
+    """
+    Wraps a deterministic (temperature 0) chat model and caches its plain-text responses,
+    keyed by a hash of the messages and the model identity. Structured-output calls made
+    by browser agents are passed through, as their prompts carry per-step page state.
+    """
+
+    def __init__(self, inner: BaseChatModel, provider: str, responses: TTLCache):
+        self._inner = inner
+        self._provider = provider
+        self._sig = f"{provider}:{inner.model}".encode()
+        self._responses = responses
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def ainvoke(self, messages, output_format=None, **kwargs):
+        if output_format is not None or kwargs:
+            return await self._inner.ainvoke(messages, output_format, **kwargs)
+        prompt = json.dumps([m.model_dump() for m in messages], sort_keys=True, default=str).encode()
+        key = hashlib.sha256(prompt + self._sig).hexdigest()
+        if key in self._responses:
+            return self._responses[key]
+        response = await self._inner.ainvoke(messages)
+        # Hits cost no tokens, so cached copies carry no usage for token tracking to count again
+        self._responses[key] = response.model_copy(update={"usage": None})
+        return response
+
+
+def copy_llm(llm: BaseChatModel, **changes) -> BaseChatModel:
+    """
+    Return a new instance of a model with the same settings, optionally overriding fields.
+    Use one per browser-use Agent, since each Agent wraps ainvoke on its model for token tracking.
+    :param llm: Model returned by get_llm_model
+    :param changes: Dataclass fields to override, e.g. http_client
+    :return: BaseChatModel instance
+    """
+    if isinstance(llm, _CachingChat):
+        return _CachingChat(copy_llm(llm._inner, **changes), llm._provider, llm._responses)
+    if not changes and not dataclasses.is_dataclass(llm):
+        return llm
+    return dataclasses.replace(llm, **changes)
+
+
 def get_llm_model(provider: str, **kwargs) -> BaseChatModel:
     """
     Get LLM model using browser-use LLM implementations
@@ -28,107 +94,138 @@ def get_llm_model(provider: str, **kwargs) -> BaseChatModel:
     :param kwargs: Additional parameters
     :return: BaseChatModel instance
     """
+    llm = _create_llm_model(provider, **kwargs)
+    # Builders apply provider-specific temperature defaults, so check the built model
+    if getattr(llm, "temperature", None) != 0:
+        return llm
+    key = _llm_cache_key(provider, kwargs)
+    if key not in _RESPONSE_CACHES:
+        _RESPONSE_CACHES[key] = TTLCache(maxsize=1024, ttl=3600)
+    return _CachingChat(llm, provider, _RESPONSE_CACHES[key])
+
+
+def _build_anthropic(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    return ChatAnthropic(
+        model=kwargs.get("model_name", "claude-3-5-sonnet-20241022"),
+        temperature=kwargs.get("temperature", 0.0),
+        base_url=kwargs.get("base_url") or _env("ANTHROPIC_ENDPOINT", "https://api.anthropic.com"),
+        api_key=api_key,
+    )
+
+
+def _build_openai(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    return ChatOpenAI(
+        model=kwargs.get("model_name", "gpt-4o"),
+        temperature=kwargs.get("temperature", 0.2),
+        base_url=kwargs.get("base_url") or _env("OPENAI_ENDPOINT", "https://api.openai.com/v1"),
+        api_key=api_key,
+    )
+
+
+def _build_google(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    return ChatGoogle(
+        model=kwargs.get("model_name", "gemini-2.0-flash-exp"),
+        temperature=kwargs.get("temperature", 0.0),
+        api_key=api_key,
+    )
+
+
+def _build_groq(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    return ChatGroq(
+        model=kwargs.get("model_name", "llama-3.1-8b-instant"),
+        temperature=kwargs.get("temperature", 0.0),
+        base_url=kwargs.get("base_url") or _env("GROQ_ENDPOINT", "https://api.groq.com/openai/v1"),
+        api_key=api_key,
+    )
+
+
+def _build_ollama(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    return ChatOllama(
+        model=kwargs.get("model_name", "qwen2.5:7b"),
+        host=kwargs.get("base_url") or _env("OLLAMA_ENDPOINT", "http://localhost:11434"),
+    )
+
+
+def _build_azure_openai(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    base_url = kwargs.get("base_url") or _env("AZURE_OPENAI_ENDPOINT", "")
+    if not base_url:
+        raise ValueError("Azure OpenAI endpoint is required")
+    return ChatAzureOpenAI(
+        model=kwargs.get("model_name", "gpt-4o"),
+        temperature=kwargs.get("temperature", 0.2),
+        base_url=base_url,
+        api_key=api_key,
+    )
+
+
+def _build_deepseek(kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    return ChatDeepSeek(
+        model=kwargs.get("model_name", "deepseek-chat"),
+        temperature=kwargs.get("temperature", 0.0),
+        base_url=kwargs.get("base_url") or _env("DEEPSEEK_ENDPOINT", "https://api.deepseek.com/v1"),
+        api_key=api_key,
+    )
+
+
+# Providers that run locally without an API key
+_NO_KEY_PROVIDERS = frozenset({"ollama"})
+
+# OpenAI-compatible provider -> (endpoint env var, default endpoint, default model)
+_COMPAT_DEFAULTS = MappingProxyType({
+    "grok": ("GROK_ENDPOINT", "https://api.x.ai/v1", "grok-3"),
+    "alibaba": ("ALIBABA_ENDPOINT", "https://dashscope.aliyuncs.com/compatible-mode/v1", "qwen-plus"),
+    "moonshot": ("MOONSHOT_ENDPOINT", "", "moonshot-v1-32k-vision-preview"),
+    "unbound": ("UNBOUND_ENDPOINT", "https://api.getunbound.ai", "gpt-4o-mini"),
+    "siliconflow": ("SILICONFLOW_ENDPOINT", "", "Qwen/QwQ-32B"),
+    "modelscope": ("MODELSCOPE_ENDPOINT", "", "Qwen/QwQ-32B"),
+})
+
+
+def _build_openai_compatible(provider: str, kwargs: Dict[str, Any], api_key: Optional[str]) -> BaseChatModel:
+    """For providers not directly supported by browser-use, use OpenAI-compatible API"""
+    env_var, default_url, default_model = _COMPAT_DEFAULTS[provider]
+    base_url = kwargs.get("base_url") or _env(env_var, default_url)
+    if not base_url:
+        raise ValueError(f"{provider} endpoint is required")
+
+    return ChatOpenAI(
+        model=kwargs.get("model_name", default_model),
+        temperature=kwargs.get("temperature", 0.2),
+        base_url=base_url,
+        api_key=api_key,
+    )
+
+
+# Provider name -> builder taking (kwargs, api_key)
+_BUILDERS: Dict[str, Callable[[Dict[str, Any], Optional[str]], BaseChatModel]] = {
+    "anthropic": _build_anthropic,
+    "openai": _build_openai,
+    "google": _build_google,
+    "groq": _build_groq,
+    "ollama": _build_ollama,
+    "azure_openai": _build_azure_openai,
+    "deepseek": _build_deepseek,
+    **{
+        provider: functools.partial(_build_openai_compatible, provider)
+        for provider in _COMPAT_DEFAULTS
+    },
+}
+
+
+def _create_llm_model(provider: str, **kwargs) -> BaseChatModel:
     # Handle API key requirement for most providers
-    if provider not in ["ollama"]:
-        env_var = f"{provider.upper()}_API_KEY"
-        api_key = kwargs.get("api_key", "") or os.getenv(env_var, "")
+    api_key = None
+    if provider not in _NO_KEY_PROVIDERS:
+        provider_u = provider.upper()
+        env_var = provider_u + "_API_KEY"
+        api_key = kwargs.get("api_key", "") or _env(env_var, "")
         if not api_key:
-            provider_display = config.PROVIDER_DISPLAY_NAMES.get(provider, provider.upper())
+            provider_display = config.PROVIDER_DISPLAY_NAMES.get(provider, provider_u)
             error_msg = f"💥 {provider_display} API key not found! 🔑 Please set the `{env_var}` environment variable or provide it in the UI."
             raise ValueError(error_msg)
         kwargs["api_key"] = api_key
 
-    if provider == "anthropic":
-        base_url = kwargs.get("base_url") or os.getenv("ANTHROPIC_ENDPOINT", "https://api.anthropic.com")
-        return ChatAnthropic(
-            model=kwargs.get("model_name", "claude-3-5-sonnet-20241022"),
-            temperature=kwargs.get("temperature", 0.0),
-            base_url=base_url,
-            api_key=api_key,
-        )
-    
-    elif provider == "openai":
-        base_url = kwargs.get("base_url") or os.getenv("OPENAI_ENDPOINT", "https://api.openai.com/v1")
-        return ChatOpenAI(
-            model=kwargs.get("model_name", "gpt-4o"),
-            temperature=kwargs.get("temperature", 0.2),
-            base_url=base_url,
-            api_key=api_key,
-        )
-    
-    elif provider == "google":
-        return ChatGoogle(
-            model=kwargs.get("model_name", "gemini-2.0-flash-exp"),
-            temperature=kwargs.get("temperature", 0.0),
-            api_key=api_key,
-        )
-    
-    elif provider == "groq":
-        base_url = kwargs.get("base_url") or os.getenv("GROQ_ENDPOINT", "https://api.groq.com/openai/v1")
-        return ChatGroq(
-            model=kwargs.get("model_name", "llama-3.1-8b-instant"),
-            temperature=kwargs.get("temperature", 0.0),
-            base_url=base_url,
-            api_key=api_key,
-        )
-    
-    elif provider == "ollama":
-        host = kwargs.get("base_url") or os.getenv("OLLAMA_ENDPOINT", "http://localhost:11434")
-        return ChatOllama(
-            model=kwargs.get("model_name", "qwen2.5:7b"),
-            host=host,
-        )
-    
-    elif provider == "azure_openai":
-        base_url = kwargs.get("base_url") or os.getenv("AZURE_OPENAI_ENDPOINT", "")
-        if not base_url:
-            raise ValueError("Azure OpenAI endpoint is required")
-        return ChatAzureOpenAI(
-            model=kwargs.get("model_name", "gpt-4o"),
-            temperature=kwargs.get("temperature", 0.2),
-            base_url=base_url,
-            api_key=api_key,
-        )
-    
-    elif provider == "deepseek":
-        base_url = kwargs.get("base_url") or os.getenv("DEEPSEEK_ENDPOINT", "https://api.deepseek.com/v1")
-        return ChatDeepSeek(
-            model=kwargs.get("model_name", "deepseek-chat"),
-            temperature=kwargs.get("temperature", 0.0),
-            base_url=base_url,
-            api_key=api_key,
-        )
-    
-    # For providers not directly supported by browser-use, use OpenAI-compatible API
-    elif provider in ["grok", "alibaba", "moonshot", "unbound", "siliconflow", "modelscope"]:
-        base_url_map = {
-            "grok": os.getenv("GROK_ENDPOINT", "https://api.x.ai/v1"),
-            "alibaba": os.getenv("ALIBABA_ENDPOINT", "https://dashscope.aliyuncs.com/compatible-mode/v1"),
-            "moonshot": os.getenv("MOONSHOT_ENDPOINT"),
-            "unbound": os.getenv("UNBOUND_ENDPOINT", "https://api.getunbound.ai"),
-            "siliconflow": os.getenv("SILICONFLOW_ENDPOINT", ""),
-            "modelscope": os.getenv("MODELSCOPE_ENDPOINT", "")
-        }
-        
-        model_defaults = {
-            "grok": "grok-3",
-            "alibaba": "qwen-plus",
-            "moonshot": "moonshot-v1-32k-vision-preview",
-            "unbound": "gpt-4o-mini",
-            "siliconflow": "Qwen/QwQ-32B",
-            "modelscope": "Qwen/QwQ-32B"
-        }
-        
-        base_url = kwargs.get("base_url") or base_url_map[provider]
-        if not base_url:
-            raise ValueError(f"{provider} endpoint is required")
-            
-        return ChatOpenAI(
-            model=kwargs.get("model_name", model_defaults[provider]),
-            temperature=kwargs.get("temperature", 0.2),
-            base_url=base_url,
-            api_key=api_key,
-        )
-    
-    else:
-        raise ValueError(f"Unsupported provider: {provider}. Supported providers: anthropic, openai, google, groq, ollama, azure_openai, deepseek, grok, alibaba, moonshot, unbound, siliconflow, modelscope")
+    builder = _BUILDERS.get(provider)
+    if builder is None:
+        raise ValueError(f"Unsupported provider: {provider}. Supported providers: {', '.join(_BUILDERS)}")
+    return builder(kwargs, api_key)
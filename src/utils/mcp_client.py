@@ -1,19 +1,29 @@
+import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from typing import Any, Dict, KeysView, List, Optional
 from browser_use.mcp import MCPClient
 from browser_use import Controller
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _Entry:
+    """A connected MCP client with its controller action prefix, computed once at connect time"""
+    client: MCPClient
+    prefix: str
+
+
 class MCPManager:
     """
     Manages multiple MCP server connections using browser-use's native MCP implementation.
     """
     
     def __init__(self):
-        self.clients: Dict[str, MCPClient] = {}
-        self.connected_servers: List[str] = []
+        # Connected clients by server name; the single source of truth for connection state
+        self.clients: Dict[str, _Entry] = {}
     
     async def setup_mcp_servers(self, mcp_server_config: Dict[str, Any]) -> bool:
         """
@@ -38,44 +48,39 @@ class MCPManager:
             logger.info(f"Setting up {len(servers_config)} MCP servers...")
             
             # Clear existing clients
-            await self.disconnect_all()
+            if self.clients:
+                await self.disconnect_all()
             
-            # Create and connect clients
+            # Create clients
+            pending = []
             for server_name, server_config in servers_config.items():
-                try:
-                    command = server_config.get("command")
-                    args = server_config.get("args", [])
-                    env = server_config.get("env", {})
-                    
-                    if not command:
-                        logger.warning(f"No command specified for MCP server '{server_name}', skipping")
-                        continue
-                    
-                    logger.info(f"Creating MCP client for server '{server_name}' with command: {command}")
-                    
-                    # Create MCP client
-                    client = MCPClient(
-                        server_name=server_name,
-                        command=command,
-                        args=args,
-                        env=env
-                    )
-                    
-                    # Connect to the server
-                    await client.connect()
-                    
-                    # Store client
-                    self.clients[server_name] = client
-                    self.connected_servers.append(server_name)
-                    
-                    logger.info(f"Successfully connected to MCP server '{server_name}'")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to setup MCP server '{server_name}': {e}", exc_info=True)
+                command = server_config.get("command")
+                if not command:
+                    logger.warning(f"No command specified for MCP server '{server_name}', skipping")
                     continue
+
+                logger.info(f"Creating MCP client for server '{server_name}' with command: {command}")
+                pending.append((server_name, MCPClient(
+                    server_name=server_name,
+                    command=command,
+                    args=server_config.get("args", []),
+                    env=server_config.get("env", {})
+                )))
+
+            # Connect to all servers concurrently
+            results = await asyncio.gather(*(client.connect() for _, client in pending), return_exceptions=True)
+            for (server_name, client), result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to setup MCP server '{server_name}': {result}", exc_info=result)
+                    continue
+
+                # Store client
+                self.clients[server_name] = _Entry(client=client, prefix=f"mcp_{server_name}_")
+
+                logger.info(f"Successfully connected to MCP server '{server_name}'")
             
-            logger.info(f"Successfully connected to {len(self.connected_servers)} MCP servers: {self.connected_servers}")
-            return len(self.connected_servers) > 0
+            logger.info(f"Successfully connected to {len(self.clients)} MCP servers: {list(self.clients)}")
+            return len(self.clients) > 0
             
         except Exception as e:
             logger.error(f"Failed to setup MCP servers: {e}", exc_info=True)
@@ -95,62 +100,91 @@ class MCPManager:
         total_tools = 0
         
         try:
-            for server_name, client in self.clients.items():
+            for server_name, entry in self.clients.items():
                 try:
                     # Register tools with server name prefix
-                    client.register_to_controller(
+                    entry.client.register_to_controller(
                         controller=controller,
                         tool_filter=tool_filter,
-                        prefix=f"mcp_{server_name}_"
+                        prefix=entry.prefix
                     )
                     
                     # Note: browser-use doesn't provide a direct way to count registered tools
                     # We'll estimate based on successful registration
-                    logger.info(f"Registered MCP tools from server '{server_name}' to controller")
                     total_tools += 1  # Increment per server for now
                     
                 except Exception as e:
                     logger.error(f"Failed to register tools from MCP server '{server_name}': {e}")
                     continue
             
-            logger.info(f"Total MCP servers registered to controller: {total_tools}")
+            logger.info(f"Registered MCP tools from {total_tools} of {len(self.clients)} server(s) to controller")
             return total_tools
             
         except Exception as e:
             logger.error(f"Failed to register MCP tools to controller: {e}", exc_info=True)
             return 0
     
+    async def register_tools_to_controller_async(
+            self, controller: Controller, tool_filter: Optional[List[str]] = None
+    ) -> int:
+        """
+        Register MCP tools from all servers to a browser-use controller concurrently.
+        
+        Args:
+            controller: Browser-use controller instance
+            tool_filter: Optional list of tool names to include (None = all tools)
+            
+        Returns:
+            int: Number of servers whose tools were registered
+        """
+        results = await asyncio.gather(
+            *(
+                entry.client.register_to_tools(tools=controller, tool_filter=tool_filter, prefix=entry.prefix)
+                for entry in self.clients.values()
+            ),
+            return_exceptions=True,
+        )
+        total_tools = 0
+        for server_name, result in zip(self.clients, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to register tools from MCP server '{server_name}': {result}")
+            else:
+                total_tools += 1
+
+        logger.info(f"Registered MCP tools from {total_tools} of {len(self.clients)} server(s) to controller")
+        return total_tools
+
     async def disconnect_all(self):
         """Disconnect from all MCP servers."""
-        for server_name, client in self.clients.items():
-            try:
-                await client.disconnect()
+        results = await asyncio.gather(
+            *(entry.client.disconnect() for entry in self.clients.values()), return_exceptions=True
+        )
+        for server_name, result in zip(self.clients, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error disconnecting from MCP server '{server_name}': {result}")
+            else:
                 logger.info(f"Disconnected from MCP server '{server_name}'")
-            except Exception as e:
-                logger.error(f"Error disconnecting from MCP server '{server_name}': {e}")
         
         self.clients.clear()
-        self.connected_servers.clear()
     
-    def get_connected_servers(self) -> List[str]:
-        """Get list of connected server names."""
-        return self.connected_servers.copy()
+    def get_connected_servers_list(self) -> List[str]:
+        """Get a copy of the connected server names."""
+        return list(self.clients)
+
+    @property
+    def connected_server_names(self) -> KeysView[str]:
+        """Live view of connected server names, for callers that only iterate or test membership."""
+        return self.clients.keys()
     
     def is_connected(self, server_name: str) -> bool:
         """Check if a specific server is connected."""
-        return server_name in self.connected_servers
-
-
-# Global MCP manager instance
-_mcp_manager: Optional[MCPManager] = None
+        return server_name in self.clients
 
 
+@functools.lru_cache(maxsize=1)
 def get_mcp_manager() -> MCPManager:
     """Get or create the global MCP manager instance."""
-    global _mcp_manager
-    if _mcp_manager is None:
-        _mcp_manager = MCPManager()
-    return _mcp_manager
+    return MCPManager()
 
 
 async def setup_mcp_client_and_tools(mcp_server_config: Dict[str, Any]) -> MCPManager:
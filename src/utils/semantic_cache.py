@@ -0,0 +1,123 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class SemanticCache:
+    """
+    In-memory LRU cache that matches queries by embedding similarity.
+
+    Uses sentence-transformers when it is installed; otherwise falls back to matching
+    whitespace/case-normalized queries exactly.
+    """
+
+    def __init__(
+            self,
+            threshold: float = 0.92,
+            max_entries: int = 128,
+            ttl_seconds: float = 3600,
+            model_name: str = DEFAULT_EMBEDDING_MODEL,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_name = model_name
+        # normalized query -> (value, embedding, created_at)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[np.ndarray], float]]" = OrderedDict()
+        self._embedder = None
+        self._embedder_loaded = False
+
+    def _get_embedder(self):
+        if not self._embedder_loaded:
+            self._embedder_loaded = True
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._embedder = SentenceTransformer(self.model_name)
+            except ImportError:
+                logger.info("sentence-transformers not installed, semantic cache uses exact query matching")
+            except Exception as e:
+                logger.warning("Failed to load embedding model %s: %s", self.model_name, e)
+        return self._embedder
+
+    def _embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+        return embedder.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [key for key, (_, _, created_at) in self._entries.items()
+                   if now - created_at > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+
+    def get(self, query: str) -> Optional[Any]:
+        """Return the cached value for the most similar query above the threshold, if any"""
+        return self.get_many([query])[0]
+
+    def get_many(self, queries: List[str]) -> List[Optional[Any]]:
+        """Look up several queries at once, embedding all exact-match misses in one batch"""
+        self._evict_expired()
+        results: List[Optional[Any]] = [None] * len(queries)
+        if not self._entries:
+            return results
+
+        misses = []
+        for i, query in enumerate(queries):
+            key = _normalize(query)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                results[i] = self._entries[key][0]
+            else:
+                misses.append((i, key))
+
+        candidates = [(k, emb) for k, (_, emb, _) in self._entries.items() if emb is not None]
+        if not misses or not candidates:
+            return results
+        vectors = self._embed([key for _, key in misses])
+        if vectors is None:
+            return results
+
+        # (entries, misses) cosine similarities; embeddings are normalized
+        scores = np.stack([emb for _, emb in candidates]) @ vectors.T
+        best = np.argmax(scores, axis=0)
+        for col, (i, key) in enumerate(misses):
+            score = scores[best[col], col]
+            if score < self.threshold:
+                continue
+            best_key = candidates[best[col]][0]
+            logger.debug("Semantic cache hit (%.3f): '%s' ~ '%s'", score, queries[i], best_key)
+            self._entries.move_to_end(best_key)
+            results[i] = self._entries[best_key][0]
+        return results
+
+    def add(self, query: str, value: Any):
+        """Store a value for the query, evicting the least recently used entry when full"""
+        self.add_many([query], [value])
+
+    def add_many(self, queries: List[str], values: List[Any]):
+        """Store values for several queries, embedding them in one batch"""
+        keys = [_normalize(query) for query in queries]
+        vectors = self._embed(keys)
+        now = time.monotonic()
+        for i, (key, value) in enumerate(zip(keys, values)):
+            self._entries[key] = (value, None if vectors is None else vectors[i], now)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
@@ -792,6 +792,8 @@ async def run_agent_task(
 
         finally:
             webui_manager.bu_current_task = None  # Clear the task reference
+            if webui_manager.bu_controller:
+                webui_manager.bu_controller.log_act_stats()
 
             # Close browser/context if requested
             if should_close_browser_on_finish:
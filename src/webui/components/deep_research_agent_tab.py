@@ -9,7 +9,7 @@ import os
 from typing import Any, Dict, AsyncGenerator, Optional, Tuple, Union
 import asyncio
 import json
-from src.agent.deep_research.deep_research_agent import DeepResearchAgent
+from src.agent.deep_research.deep_research_agent import DEFAULT_MAX_CONCURRENCY, DeepResearchAgent
 from src.utils import llm_provider
 
 logger = logging.getLogger(__name__)
@@ -170,6 +170,7 @@ async def run_deep_research(webui_manager: WebuiManager, components: Dict[Compon
             "user_data_dir": get_setting("browser_settings", "browser_user_data_dir"),
             "window_width": int(get_setting("browser_settings", "window_w", 1280)),
             "window_height": int(get_setting("browser_settings", "window_h", 1100)),
+            "max_concurrency": max(max_parallel_agents, 1),
             # Add other relevant fields if DeepResearchAgent accepts them
         }
 
@@ -402,7 +403,7 @@ def create_deep_research_agent_tab(webui_manager: WebuiManager):
         with gr.Row():
             resume_task_id = gr.Textbox(label="Resume Task ID", value="",
                                         interactive=True)
-            parallel_num = gr.Number(label="Parallel Agent Num", value=1,
+            parallel_num = gr.Number(label="Parallel Agent Num", value=DEFAULT_MAX_CONCURRENCY,
                                      precision=0,
                                      interactive=True)
             max_query = gr.Textbox(label="Research Save Dir", value="./tmp/deep_research",
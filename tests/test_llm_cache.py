@@ -0,0 +1,117 @@
+import asyncio
+import sys
+
+sys.path.append(".")
+
+from browser_use.llm import SystemMessage, UserMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from src.utils import llm_provider
+from src.utils.llm_provider import _CachingChat
+
+
+def make_usage() -> ChatInvokeUsage:
+    return ChatInvokeUsage(
+        prompt_tokens=10,
+        prompt_cached_tokens=None,
+        prompt_cache_creation_tokens=None,
+        prompt_image_tokens=None,
+        completion_tokens=5,
+        total_tokens=15,
+    )
+
+
+class FakeChat:
+    """Stands in for a browser-use chat model and records each call"""
+    model = "fake-model"
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = []
+
+    async def ainvoke(self, messages, output_format=None, **kwargs):
+        self.calls.append((messages, output_format, kwargs))
+        return ChatInvokeCompletion(completion=f"answer {len(self.calls)}", usage=make_usage())
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def make_chat():
+    inner = FakeChat()
+    return _CachingChat(inner, "fake", TTLCache(maxsize=8, ttl=60)), inner
+
+
+def messages(text: str):
+    return [SystemMessage(content="You are helpful."), UserMessage(content=text)]
+
+
+def test_repeated_prompt_is_cached():
+    chat, inner = make_chat()
+
+    async def run():
+        first = await chat.ainvoke(messages("hello"))
+        second = await chat.ainvoke(messages("hello"))
+        other = await chat.ainvoke(messages("goodbye"))
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+    assert len(inner.calls) == 2
+    assert second.completion == first.completion
+    assert other.completion != first.completion
+
+
+def test_cached_hits_carry_no_usage():
+    chat, _ = make_chat()
+
+    async def run():
+        return await chat.ainvoke(messages("hello")), await chat.ainvoke(messages("hello"))
+
+    first, hit = asyncio.run(run())
+    assert first.usage is not None  # the real call is still counted once
+    assert hit.usage is None
+
+
+def test_structured_output_and_kwargs_pass_through():
+    chat, inner = make_chat()
+
+    async def run():
+        for _ in range(2):
+            await chat.ainvoke(messages("hello"), Answer)
+            await chat.ainvoke(messages("hello"), session_id="abc")
+
+    asyncio.run(run())
+    assert len(inner.calls) == 4
+    assert inner.calls[0][1] is Answer
+    assert inner.calls[1][2] == {"session_id": "abc"}
+    assert not chat._responses
+
+
+def test_attributes_delegate_to_inner_model():
+    chat, inner = make_chat()
+    assert chat.model == inner.model
+    assert chat.temperature == 0.0
+
+
+def test_only_temperature_zero_models_are_wrapped():
+    # the openai builder defaults to temperature 0.2
+    default = llm_provider.get_llm_model("openai", model_name="gpt-4o", api_key="test-key")
+    assert not isinstance(default, _CachingChat)
+
+    first = llm_provider.get_llm_model("openai", model_name="gpt-4o", api_key="test-key", temperature=0.0)
+    second = llm_provider.get_llm_model("openai", model_name="gpt-4o", api_key="test-key", temperature=0.0)
+    assert isinstance(first, _CachingChat)
+    assert first is not second
+    assert first._responses is second._responses
+
+
+if __name__ == "__main__":
+    test_repeated_prompt_is_cached()
+    test_cached_hits_carry_no_usage()
+    test_structured_output_and_kwargs_pass_through()
+    test_attributes_delegate_to_inner_model()
+    test_only_temperature_zero_models_are_wrapped()
+    print("All LLM cache tests passed")
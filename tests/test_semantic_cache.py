@@ -0,0 +1,100 @@
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(".")
+
+from src.utils.semantic_cache import SemanticCache
+
+# Fixed unit vectors per normalized query, so similarities are known without a real model
+VECTORS = {
+    "weather in paris": [1.0, 0.0, 0.0],
+    "paris weather": [0.95, np.sqrt(1 - 0.95 ** 2), 0.0],
+    "paris weather today": [0.8, 0.6, 0.0],
+    "stock prices": [0.0, 0.0, 1.0],
+}
+
+
+class StubEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True):
+        self.batches.append(list(texts))
+        return np.array([VECTORS[text] for text in texts])
+
+
+def make_cache(**kwargs) -> SemanticCache:
+    cache = SemanticCache(**kwargs)
+    cache._embedder = StubEmbedder()
+    cache._embedder_loaded = True
+    return cache
+
+
+def exact_cache(**kwargs) -> SemanticCache:
+    cache = SemanticCache(**kwargs)
+    cache._embedder_loaded = True  # no embedder, as when sentence-transformers is missing
+    return cache
+
+
+def test_similarity_threshold():
+    cache = make_cache(threshold=0.9)
+    cache.add("Weather in Paris", "report")
+    assert cache.get("paris weather") == "report"  # similarity 0.95
+    assert cache.get("paris weather today") is None  # similarity 0.8
+    assert cache.get("stock prices") is None
+
+
+def test_exact_match_fallback():
+    cache = exact_cache()
+    cache.add("Weather  in Paris", "report")
+    assert cache.get("weather in paris") == "report"
+    assert cache.get("paris weather") is None
+
+
+def test_ttl_expiry():
+    cache = exact_cache(ttl_seconds=0.05)
+    cache.add("weather in paris", "report")
+    assert cache.get("weather in paris") == "report"
+    time.sleep(0.1)
+    assert cache.get("weather in paris") is None
+    assert not cache._entries
+
+
+def test_lru_eviction():
+    cache = exact_cache(max_entries=2)
+    cache.add("a", 1)
+    cache.add("b", 2)
+    assert cache.get("a") == 1  # a is now most recently used
+    cache.add("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_get_many_add_many_alignment():
+    cache = make_cache(threshold=0.9)
+    cache.add_many(["weather in paris", "stock prices"], ["paris", "stocks"])
+    assert cache._embedder.batches == [["weather in paris", "stock prices"]]
+
+    results = cache.get_many(["stock prices", "paris weather today", "paris weather", "Weather in Paris"])
+    assert results == ["stocks", None, "paris", "paris"]
+    # exact hits skip embedding; both misses are embedded in one batch
+    assert cache._embedder.batches[-1] == ["paris weather today", "paris weather"]
+
+
+def test_empty_cache_skips_embedding():
+    cache = make_cache()
+    assert cache.get_many(["weather in paris", "stock prices"]) == [None, None]
+    assert cache._embedder.batches == []
+
+
+if __name__ == "__main__":
+    test_similarity_threshold()
+    test_exact_match_fallback()
+    test_ttl_expiry()
+    test_lru_eviction()
+    test_get_many_add_many_alignment()
+    test_empty_cache_skips_embedding()
+    print("All semantic cache tests passed")
@@ -1,9 +1,19 @@
 from dotenv import load_dotenv
 load_dotenv()
 import argparse
+import asyncio
 from src.webui.interface import theme_map, create_ui
 
 
+def install_uvloop():
+    """Use uvloop for asyncio event loops when it is installed (Linux/macOS only)"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def main():
     parser = argparse.ArgumentParser(description="Gradio WebUI for Browser Agent")
     parser.add_argument("--ip", type=str, default="127.0.0.1", help="IP address to bind to")
@@ -11,6 +21,8 @@ def main():
     parser.add_argument("--theme", type=str, default="Ocean", choices=theme_map.keys(), help="Theme to use for the UI")
     args = parser.parse_args()
 
+    install_uvloop()
+
     demo = create_ui(theme_name=args.theme)
     demo.queue().launch(server_name=args.ip, server_port=args.port)
 